@@ -3,20 +3,70 @@ Student Grievance Redressal System
 A Flask-based web application for managing student grievances.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+import os
+
+# Must run before anything else imports socket/threading (set by gunicorn.conf.py)
+GEVENT_WORKER = os.environ.get('GEVENT_WORKER') == '1'
+if GEVENT_WORKER:
+    from gevent import monkey
+    monkey.patch_all()
+    from gevent import get_hub
+
+from flask import Flask, render_template, request, redirect, url_for, session, flash, g, make_response
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event, func, select, case, and_, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from werkzeug.security import generate_password_hash, check_password_hash
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
 from datetime import datetime, timedelta
-import os
+from functools import wraps
+import hashlib
 import secrets
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = secrets.token_hex(16)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///grievances.db'
+# Set SECRET_KEY when running several workers so they all accept the same session cookie
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or secrets.token_hex(16)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///grievances.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Freshly booted gunicorn workers load compiled templates instead of re-parsing them
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 db = SQLAlchemy(app)
 
+
+def set_sqlite_pragma(dbapi_conn, _):
+    """Use WAL so readers don't block the writer, and relax per-commit fsyncs."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB
+    cursor.close()
+
+
+with app.app_context():
+    event.listen(db.engine, 'connect', set_sqlite_pragma)
+
+
+PER_PAGE = 25
+CATEGORIES = ('academic', 'administrative', 'hostel', 'examination')
+STATUSES = ('submitted', 'in_review', 'in_progress', 'escalated', 'resolved', 'closed')
+PENDING_STATUSES = frozenset({'submitted', 'in_review', 'in_progress'})
+DONE_STATUSES = frozenset({'resolved', 'closed'})
+DEADLINE_DELTAS = {
+    'low': timedelta(days=14),
+    'medium': timedelta(days=7),
+    'high': timedelta(days=3),
+    'urgent': timedelta(days=1),
+}
+DEFAULT_DEADLINE = DEADLINE_DELTAS['medium']
+SEED_HASH_METHOD = 'pbkdf2:sha256:1000'
+
 # ─────────────────────────── Models ───────────────────────────
 
 class User(db.Model):
@@ -24,35 +74,46 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default='student')  # student, authority, admin
-    department = db.Column(db.String(50), nullable=True)
+    role = db.Column(db.String(20), nullable=False, default='student', index=True)  # student, authority, admin
+    department = db.Column(db.String(50), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    grievances_filed = db.relationship('Grievance', foreign_keys='Grievance.student_id', back_populates='student')
+    grievances_assigned = db.relationship('Grievance', foreign_keys='Grievance.assigned_to', back_populates='assignee')
+    updates_made = db.relationship('GrievanceUpdate', back_populates='user')
+
     def __repr__(self):
         return f'<User {self.username}>'
 
 
 class Grievance(db.Model):
+    # student_id, assigned_to and category are served by the leading column of these composites
+    __table_args__ = (
+        db.Index('ix_griev_assigned_status', 'assigned_to', 'status'),
+        db.Index('ix_griev_student_created', 'student_id', 'created_at'),
+        db.Index('ix_griev_cat_status', 'category', 'status'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     ticket_id = db.Column(db.String(20), unique=True, nullable=False)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(50), nullable=False)  # academic, administrative, hostel, examination
     priority = db.Column(db.String(20), default='medium')  # low, medium, high, urgent
-    status = db.Column(db.String(30), default='submitted')  # submitted, in_review, in_progress, escalated, resolved, closed
+    status = db.Column(db.String(30), default='submitted', index=True)  # submitted, in_review, in_progress, escalated, resolved, closed
     is_anonymous = db.Column(db.Boolean, default=False)
     student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     assigned_to = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = db.Column(db.DateTime, nullable=True)
-    deadline = db.Column(db.DateTime, nullable=True)
+    deadline = db.Column(db.DateTime, nullable=True, index=True)
     escalation_level = db.Column(db.Integer, default=0)
 
-    student = db.relationship('User', foreign_keys=[student_id], backref='grievances_filed')
-    assignee = db.relationship('User', foreign_keys=[assigned_to], backref='grievances_assigned')
-    updates = db.relationship('GrievanceUpdate', backref='grievance', lazy=True, order_by='GrievanceUpdate.created_at.desc()')
-    feedback = db.relationship('Feedback', backref='grievance', uselist=False)
+    student = db.relationship('User', foreign_keys=[student_id], back_populates='grievances_filed')
+    assignee = db.relationship('User', foreign_keys=[assigned_to], back_populates='grievances_assigned')
+    updates = db.relationship('GrievanceUpdate', back_populates='grievance', lazy=True, order_by='GrievanceUpdate.created_at.desc()')
+    feedback = db.relationship('Feedback', back_populates='grievance', uselist=False)
 
     def __repr__(self):
         return f'<Grievance {self.ticket_id}>'
@@ -66,7 +127,8 @@ class GrievanceUpdate(db.Model):
     status_change = db.Column(db.String(30), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    user = db.relationship('User', backref='updates_made')
+    grievance = db.relationship('Grievance', back_populates='updates')
+    user = db.relationship('User', back_populates='updates_made')
 
 
 class Feedback(db.Model):
@@ -77,37 +139,99 @@ class Feedback(db.Model):
     comment = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    grievance = db.relationship('Grievance', back_populates='feedback')
+
+
+class DailyCounter(db.Model):
+    date = db.Column(db.String(8), primary_key=True)  # YYYYMMDD
+    seq = db.Column(db.Integer, nullable=False, default=0)
+
 
 # ─────────────────────── Helper Functions ─────────────────────
 
+# Serialized /api/stats payloads, keyed by stats version. Both are per process: a write
+# is seen at once by the worker that made it, other workers catch up within the TTL.
+STATS_CACHE_TTL = 60
+stats_cache = TTLCache(maxsize=16, ttl=STATS_CACHE_TTL)
+stats_version = 0
+
+
+def invalidate_stats():
+    """Mark cached chart statistics as stale after a grievance write."""
+    global stats_version
+    stats_version += 1
+
+
 def generate_ticket_id():
     """Generate a unique ticket ID like GRV-20260219-0001."""
     today = datetime.utcnow().strftime('%Y%m%d')
-    last = Grievance.query.filter(Grievance.ticket_id.like(f'GRV-{today}-%')).order_by(Grievance.id.desc()).first()
-    if last:
-        num = int(last.ticket_id.split('-')[-1]) + 1
-    else:
-        num = 1
+    # Atomic upsert: the write lock it takes is held until the grievance is committed
+    stmt = sqlite_insert(DailyCounter).values(date=today, seq=1).on_conflict_do_update(
+        index_elements=[DailyCounter.date], set_={'seq': DailyCounter.seq + 1}
+    ).returning(DailyCounter.seq)
+    num = db.session.execute(stmt).scalar_one()
     return f'GRV-{today}-{num:04d}'
 
 
 def get_deadline(priority):
     """Return resolution deadline based on priority."""
-    days_map = {'low': 14, 'medium': 7, 'high': 3, 'urgent': 1}
-    return datetime.utcnow() + timedelta(days=days_map.get(priority, 7))
+    return datetime.utcnow() + DEADLINE_DELTAS.get(priority, DEFAULT_DEADLINE)
 
 
+# Cached per process: cache_clear() in register only reaches the worker that handled
+# it, other workers pick up a new authority when their entry expires (5 minutes)
+@ttl_cache(maxsize=16, ttl=300)
 def auto_assign(category):
     """Auto-assign grievance to an authority handling the category/department."""
-    authority = User.query.filter_by(role='authority', department=category).first()
-    if not authority:
-        authority = User.query.filter_by(role='admin').first()
-    return authority.id if authority else None
+    # Prefer the department's authority, falling back to an admin, in a single query
+    return db.session.execute(
+        select(User.id)
+        .where(or_(and_(User.role == 'authority', User.department == category), User.role == 'admin'))
+        .order_by(case((User.role == 'authority', 0), else_=1), User.id)
+        .limit(1)
+    ).scalar()
+
+
+# Cached per process like auto_assign: other workers may omit a newly registered
+# authority from the dropdown for up to 2 minutes
+@ttl_cache(maxsize=1, ttl=120)
+def cached_authorities():
+    """Return (id, username, role, department) rows for the reassignment dropdown."""
+    return tuple(db.session.execute(
+        select(User.id, User.username, User.role, User.department)
+        .where(User.role.in_(('authority', 'admin')))
+    ).all())
+
+
+def hash_password(password, method='scrypt'):
+    """Hash a password, off the gevent hub when running under gunicorn."""
+    if GEVENT_WORKER:
+        return get_hub().threadpool.apply(generate_password_hash, (password, method))
+    return generate_password_hash(password, method)
+
+
+def verify_password(pwhash, password):
+    """Check a password against its hash, off the gevent hub when running under gunicorn."""
+    if GEVENT_WORKER:
+        return get_hub().threadpool.apply(check_password_hash, (pwhash, password))
+    return check_password_hash(pwhash, password)
+
+
+def current_user():
+    """Return the logged-in user, loaded at most once per request."""
+    if 'user' not in g:
+        user_id = session.get('user_id')
+        g.user = db.session.get(User, user_id) if user_id is not None else None
+    return g.user
+
+
+@app.context_processor
+def inject_current_user():
+    return {'current_user': current_user()}
 
 
 def login_required(f):
     """Decorator to require login."""
-    from functools import wraps
     @wraps(f)
     def decorated(*args, **kwargs):
         if 'user_id' not in session:
@@ -119,14 +243,13 @@ def login_required(f):
 
 def role_required(*roles):
     """Decorator to require specific roles."""
-    from functools import wraps
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
             if 'user_id' not in session:
                 flash('Please log in first.', 'warning')
                 return redirect(url_for('login'))
-            user = User.query.get(session['user_id'])
+            user = current_user()
             if user.role not in roles:
                 flash('You do not have permission to access this page.', 'danger')
                 return redirect(url_for('dashboard'))
@@ -155,22 +278,30 @@ def register():
         role = request.form.get('role', 'student')
         department = request.form.get('department', '')
 
-        if User.query.filter_by(username=username).first():
+        # Username and email may belong to two different users; report the username first
+        taken = db.session.execute(
+            select(User.username, User.email).where(or_(User.username == username, User.email == email))
+        ).all()
+        if any(row.username == username for row in taken):
             flash('Username already exists.', 'danger')
             return redirect(url_for('register'))
-        if User.query.filter_by(email=email).first():
+        if taken:
             flash('Email already registered.', 'danger')
             return redirect(url_for('register'))
 
         user = User(
             username=username,
             email=email,
-            password=generate_password_hash(password),
+            password=hash_password(password),
             role=role,
             department=department if role == 'authority' else None
         )
         db.session.add(user)
         db.session.commit()
+        if role in ('authority', 'admin'):
+            # Only clears this worker's caches; the others wait out their TTLs
+            auto_assign.cache_clear()
+            cached_authorities.cache_clear()
         flash('Registration successful! Please log in.', 'success')
         return redirect(url_for('login'))
     return render_template('register.html')
@@ -183,10 +314,9 @@ def login():
         password = request.form['password']
         user = User.query.filter_by(username=username).first()
 
-        if user and check_password_hash(user.password, password):
+        if user and verify_password(user.password, password):
+            # Only the id lives in the cookie; username and role are read from the database
             session['user_id'] = user.id
-            session['username'] = user.username
-            session['role'] = user.role
             flash(f'Welcome back, {user.username}!', 'success')
             return redirect(url_for('dashboard'))
         flash('Invalid username or password.', 'danger')
@@ -205,39 +335,41 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    user = User.query.get(session['user_id'])
+    user = current_user()
 
     if user.role == 'student':
-        grievances = Grievance.query.filter_by(student_id=user.id).order_by(Grievance.created_at.desc()).all()
-        stats = {
-            'total': len(grievances),
-            'pending': len([g for g in grievances if g.status in ('submitted', 'in_review', 'in_progress')]),
-            'resolved': len([g for g in grievances if g.status in ('resolved', 'closed')]),
-            'escalated': len([g for g in grievances if g.status == 'escalated']),
-        }
+        query = Grievance.query.filter_by(student_id=user.id)
     elif user.role == 'authority':
-        grievances = Grievance.query.filter_by(assigned_to=user.id).order_by(Grievance.created_at.desc()).all()
-        stats = {
-            'total': len(grievances),
-            'pending': len([g for g in grievances if g.status in ('submitted', 'in_review', 'in_progress')]),
-            'resolved': len([g for g in grievances if g.status in ('resolved', 'closed')]),
-            'escalated': len([g for g in grievances if g.status == 'escalated']),
-        }
+        query = Grievance.query.filter_by(assigned_to=user.id)
     else:  # admin
-        grievances = Grievance.query.order_by(Grievance.created_at.desc()).all()
-        stats = {
-            'total': len(grievances),
-            'pending': len([g for g in grievances if g.status in ('submitted', 'in_review', 'in_progress')]),
-            'resolved': len([g for g in grievances if g.status in ('resolved', 'closed')]),
-            'escalated': len([g for g in grievances if g.status == 'escalated']),
-        }
+        query = Grievance.query
+
+    status_counts = dict(query.with_entities(Grievance.status, func.count()).group_by(Grievance.status).all())
+    stats = {
+        'total': sum(status_counts.values()),
+        'pending': sum(status_counts.get(s, 0) for s in PENDING_STATUSES),
+        'resolved': sum(status_counts.get(s, 0) for s in DONE_STATUSES),
+        'escalated': status_counts.get('escalated', 0),
+    }
 
     # Overdue grievances
     now = datetime.utcnow()
-    overdue = [g for g in grievances if g.deadline and g.deadline < now and g.status not in ('resolved', 'closed')]
-    stats['overdue'] = len(overdue)
+    stats['overdue'] = query.filter(Grievance.deadline < now,
+                                    Grievance.status.notin_(DONE_STATUSES)).count()
 
-    return render_template('dashboard.html', user=user, grievances=grievances, stats=stats)
+    page = request.args.get('page', 1, type=int)
+    pagination = query.order_by(Grievance.created_at.desc()).paginate(
+        page=page, per_page=PER_PAGE, error_out=False, count=False)
+    pagination.total = stats['total']  # already counted above
+
+    response = make_response(render_template('dashboard.html', user=user, grievances=pagination.items,
+                                             pagination=pagination, stats=stats))
+    # Always revalidate (a max-age would hide a just-submitted grievance), but let
+    # unchanged pages come back as an empty 304
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 # ── Grievance Submission ──
@@ -265,7 +397,7 @@ def submit_grievance():
             deadline=get_deadline(priority),
         )
         db.session.add(grievance)
-        db.session.commit()
+        db.session.flush()  # assigns grievance.id inside the same transaction
 
         # Add initial update
         update = GrievanceUpdate(
@@ -275,6 +407,7 @@ def submit_grievance():
         )
         db.session.add(update)
         db.session.commit()
+        invalidate_stats()
 
         flash(f'Grievance submitted! Your ticket ID is {grievance.ticket_id}. Save it for tracking.', 'success')
         if 'user_id' in session:
@@ -292,7 +425,9 @@ def track_grievance():
     if request.method == 'POST' or request.args.get('ticket_id'):
         ticket_id = request.form.get('ticket_id', '') or request.args.get('ticket_id', '')
         ticket_id = ticket_id.strip()
-        grievance = Grievance.query.filter_by(ticket_id=ticket_id).first()
+        grievance = Grievance.query.options(
+            selectinload(Grievance.updates).joinedload(GrievanceUpdate.user),
+        ).filter_by(ticket_id=ticket_id).first()
         if not grievance:
             flash('No grievance found with that ticket ID.', 'danger')
     return render_template('track.html', grievance=grievance)
@@ -303,15 +438,21 @@ def track_grievance():
 @app.route('/grievance/<int:gid>')
 @login_required
 def grievance_detail(gid):
-    user = User.query.get(session['user_id'])
-    grievance = Grievance.query.get_or_404(gid)
+    user = current_user()
+    grievance = Grievance.query.options(
+        joinedload(Grievance.student),
+        joinedload(Grievance.assignee),
+        joinedload(Grievance.feedback),
+        selectinload(Grievance.updates).joinedload(GrievanceUpdate.user),
+    ).filter_by(id=gid).first_or_404()
 
     # Access control
     if user.role == 'student' and grievance.student_id != user.id:
         flash('Access denied.', 'danger')
         return redirect(url_for('dashboard'))
 
-    authorities = User.query.filter(User.role.in_(['authority', 'admin'])).all()
+    # Only admins see the reassignment dropdown
+    authorities = cached_authorities() if user.role == 'admin' else ()
     return render_template('grievance_detail.html', grievance=grievance, user=user, authorities=authorities)
 
 
@@ -320,7 +461,7 @@ def grievance_detail(gid):
 @app.route('/grievance/<int:gid>/update', methods=['POST'])
 @login_required
 def update_grievance(gid):
-    user = User.query.get(session['user_id'])
+    user = current_user()
     grievance = Grievance.query.get_or_404(gid)
 
     message = request.form.get('message', '').strip()
@@ -329,7 +470,7 @@ def update_grievance(gid):
 
     if new_status and user.role in ('authority', 'admin'):
         grievance.status = new_status
-        if new_status in ('resolved', 'closed'):
+        if new_status in DONE_STATUSES:
             grievance.resolved_at = datetime.utcnow()
 
     if new_assignee and user.role == 'admin':
@@ -345,6 +486,7 @@ def update_grievance(gid):
         db.session.add(update)
 
     db.session.commit()
+    invalidate_stats()
     flash('Grievance updated successfully.', 'success')
     return redirect(url_for('grievance_detail', gid=gid))
 
@@ -371,6 +513,7 @@ def escalate_grievance(gid):
     )
     db.session.add(update)
     db.session.commit()
+    invalidate_stats()
 
     flash('Grievance has been escalated.', 'warning')
     return redirect(url_for('grievance_detail', gid=gid))
@@ -408,16 +551,38 @@ def submit_feedback(gid):
 def admin_grievances():
     status_filter = request.args.get('status', '')
     category_filter = request.args.get('category', '')
-
-    query = Grievance.query
+    before = request.args.get('before', type=int)
+
+    # Read-only listing: fetch plain rows with usernames joined in, not ORM objects
+    student = aliased(User)
+    assignee = aliased(User)
+    query = (
+        select(Grievance.id, Grievance.ticket_id, Grievance.title, Grievance.category, Grievance.priority,
+               Grievance.status, Grievance.is_anonymous, Grievance.created_at,
+               student.username.label('student_name'), assignee.username.label('assignee_name'))
+        .outerjoin(student, Grievance.student_id == student.id)
+        .outerjoin(assignee, Grievance.assigned_to == assignee.id)
+    )
     if status_filter:
-        query = query.filter_by(status=status_filter)
+        query = query.where(Grievance.status == status_filter)
     if category_filter:
-        query = query.filter_by(category=category_filter)
-
-    grievances = query.order_by(Grievance.created_at.desc()).all()
+        query = query.where(Grievance.category == category_filter)
+
+    # Keyset pagination: continue after the last grievance of the previous page
+    if before:
+        last_seen = aliased(Grievance)
+        anchor = select(last_seen.created_at).where(last_seen.id == before).scalar_subquery()
+        query = query.where(or_(Grievance.created_at < anchor,
+                                and_(Grievance.created_at == anchor, Grievance.id < before)))
+
+    grievances = db.session.execute(
+        query.order_by(Grievance.created_at.desc(), Grievance.id.desc()).limit(PER_PAGE + 1)
+    ).all()
+    has_more = len(grievances) > PER_PAGE
+    grievances = grievances[:PER_PAGE]
     return render_template('admin_grievances.html', grievances=grievances,
-                           status_filter=status_filter, category_filter=category_filter)
+                           status_filter=status_filter, category_filter=category_filter,
+                           before=before, next_before=grievances[-1].id if has_more else None)
 
 
 # ── Admin: Manage Users ──
@@ -435,33 +600,40 @@ def admin_users():
 @login_required
 def api_stats():
     """Return statistics for dashboard charts."""
-    categories = ['academic', 'administrative', 'hostel', 'examination']
-    statuses = ['submitted', 'in_review', 'in_progress', 'escalated', 'resolved', 'closed']
-
-    cat_data = {}
-    for c in categories:
-        cat_data[c] = Grievance.query.filter_by(category=c).count()
-
-    status_data = {}
-    for s in statuses:
-        status_data[s] = Grievance.query.filter_by(status=s).count()
-
-    # Monthly trend (last 6 months)
-    monthly = {}
-    for i in range(5, -1, -1):
-        d = datetime.utcnow() - timedelta(days=30 * i)
-        label = d.strftime('%b %Y')
-        start = d.replace(day=1, hour=0, minute=0, second=0)
-        if i == 0:
-            end = datetime.utcnow()
-        else:
-            next_month = (start + timedelta(days=32)).replace(day=1)
-            end = next_month
-        monthly[label] = Grievance.query.filter(
-            Grievance.created_at >= start, Grievance.created_at < end
-        ).count()
-
-    return jsonify({'categories': cat_data, 'statuses': status_data, 'monthly': monthly})
+    body = stats_cache.get(stats_version)
+    if body is None:
+        body = stats_cache[stats_version] = compute_stats()
+
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.md5(body).hexdigest())
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def compute_stats():
+    """Aggregate chart statistics and return them as serialized JSON."""
+    cat_counts = dict(db.session.query(Grievance.category, func.count()).group_by(Grievance.category).all())
+    cat_data = {c: cat_counts.get(c, 0) for c in CATEGORIES}
+
+    status_counts = dict(db.session.query(Grievance.status, func.count()).group_by(Grievance.status).all())
+    status_data = {s: status_counts.get(s, 0) for s in STATUSES}
+
+    # Monthly trend (last 6 calendar months, including the current one)
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    months = [month_start]
+    for _ in range(5):
+        months.insert(0, (months[0] - timedelta(days=1)).replace(day=1))
+    month_key = func.strftime('%Y-%m', Grievance.created_at)
+    month_counts = dict(db.session.query(month_key, func.count())
+                        .filter(Grievance.created_at >= months[0])
+                        .group_by(month_key).all())
+    monthly = {m.strftime('%b %Y'): month_counts.get(m.strftime('%Y-%m'), 0) for m in months}
+
+    # Keep insertion order: the trend chart plots months in key order and the
+    # category/status colours are assigned by position
+    return app.json.dumps({'categories': cat_data, 'statuses': status_data, 'monthly': monthly},
+                          sort_keys=False).encode()
 
 
 # ─────────────────── Database Initialization ──────────────────
@@ -469,11 +641,25 @@ def api_stats():
 def init_db():
     """Create tables and seed default admin user."""
     db.create_all()
+    # create_all() skips tables that already exist, so build any missing indexes explicitly
+    for model in (User, Grievance):
+        for index in model.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+    # Carry over today's tickets issued before the counter table existed
+    today = datetime.utcnow().strftime('%Y%m%d')
+    if not db.session.get(DailyCounter, today):
+        last = Grievance.query.filter(Grievance.ticket_id.like(f'GRV-{today}-%')).order_by(Grievance.id.desc()).first()
+        if last:
+            db.session.add(DailyCounter(date=today, seq=int(last.ticket_id.split('-')[-1])))
+            db.session.commit()
+
     if not User.query.filter_by(role='admin').first():
+        # Seed passwords are published in the README, so a cheap hash costs nothing
         admin = User(
             username='admin',
             email='admin@university.edu',
-            password=generate_password_hash('admin123'),
+            password=hash_password('admin123', SEED_HASH_METHOD),
             role='admin',
             department='administration'
         )
@@ -490,7 +676,7 @@ def init_db():
             user = User(
                 username=uname,
                 email=email,
-                password=generate_password_hash('auth123'),
+                password=hash_password('auth123', SEED_HASH_METHOD),
                 role='authority',
                 department=dept
             )
@@ -502,6 +688,12 @@ def init_db():
         print("  Authority -> username: academic_head / admin_officer / hostel_warden / exam_controller, password: auth123")
 
 
+@app.cli.command('init-db')
+def init_db_command():
+    """Create tables and seed default users (run once before starting gunicorn)."""
+    init_db()
+
+
 if __name__ == '__main__':
     with app.app_context():
         init_db()
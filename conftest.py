@@ -0,0 +1,98 @@
+"""
+Shared pytest fixtures: a seeded temporary SQLite database, logged-in test
+clients and a counter for the SQL statements a block of code executes.
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+
+@pytest.fixture(scope='session')
+def sgrs(tmp_path_factory):
+    """Import the application against a fresh, seeded database."""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + str(tmp_path_factory.mktemp('db') / 'grievances.db')
+    import app as sgrs
+
+    sgrs.app.config['TESTING'] = True
+    with sgrs.app.app_context():
+        sgrs.init_db()
+        seed_grievances(sgrs)
+
+    # Any relationship a view forgets to eager-load fails the request instead of
+    # silently issuing one extra query per row
+    event.listen(sgrs.db.session, 'do_orm_execute', raise_on_lazy_load)
+    return sgrs
+
+
+def raise_on_lazy_load(state):
+    if state.is_select and not state.is_relationship_load:
+        state.statement = state.statement.options(raiseload('*'))
+
+
+def seed_grievances(sgrs):
+    """Add a student and enough grievances, updates and feedback to expose N+1 queries."""
+    db, Grievance = sgrs.db, sgrs.Grievance
+    student = sgrs.User(username='student', email='student@university.edu',
+                        password=sgrs.hash_password('student123', sgrs.SEED_HASH_METHOD), role='student')
+    db.session.add(student)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    for i in range(30):
+        category = sgrs.CATEGORIES[i % len(sgrs.CATEGORIES)]
+        status = sgrs.STATUSES[i % len(sgrs.STATUSES)]
+        grievance = Grievance(
+            ticket_id=f'GRV-TEST-{i:04d}',
+            title=f'Test grievance {i}',
+            description='Seeded for query-count tests.',
+            category=category,
+            status=status,
+            student_id=student.id,
+            assigned_to=sgrs.auto_assign(category),
+            created_at=now - timedelta(days=i * 7),
+            deadline=now + timedelta(days=7 - i),
+        )
+        db.session.add(grievance)
+        db.session.flush()
+        for author in (None, student.id, grievance.assigned_to):
+            db.session.add(sgrs.GrievanceUpdate(grievance_id=grievance.id, user_id=author,
+                                                message='Seeded update.', status_change=status))
+        if status in sgrs.DONE_STATUSES:
+            db.session.add(sgrs.Feedback(grievance_id=grievance.id, user_id=student.id, rating=4))
+    db.session.commit()
+
+
+@pytest.fixture
+def login(sgrs):
+    """Return a factory for test clients logged in as the given user."""
+    def make_client(username, password):
+        client = sgrs.app.test_client()
+        response = client.post('/login', data={'username': username, 'password': password})
+        assert response.status_code == 302
+        return client
+    return make_client
+
+
+@pytest.fixture
+def count_queries(sgrs):
+    """Return a context manager collecting the SQL statements run inside it."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with sgrs.app.app_context():
+            engine = sgrs.db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return counter
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for production.
+Run with: gunicorn app:app
+"""
+
+import multiprocessing
+import os
+
+# Tells app.py to monkey-patch the standard library before importing Flask
+os.environ.setdefault('GEVENT_WORKER', '1')
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gevent'
+worker_connections = 1000
+keepalive = 5
+
+
+def on_starting(server):
+    # app.py falls back to a random per-process key, which would log users out
+    # whenever a request lands on a different worker
+    if server.cfg.workers > 1 and not os.environ.get('SECRET_KEY'):
+        raise RuntimeError('Set SECRET_KEY so all gunicorn workers sign sessions with the same key')
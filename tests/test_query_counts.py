@@ -0,0 +1,58 @@
+"""
+Per-route ceilings on SQL statements. A regression (new lazy load, counting in
+Python, per-bucket COUNTs) pushes a route over its limit and fails here.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('username, password', [
+    ('student', 'student123'),
+    ('academic_head', 'auth123'),
+    ('admin', 'admin123'),
+])
+def test_dashboard(login, count_queries, username, password):
+    client = login(username, password)
+    with count_queries() as queries:
+        response = client.get('/dashboard')
+    assert response.status_code == 200
+    assert len(queries) <= 4
+
+
+def test_grievance_detail(sgrs, login, count_queries):
+    client = login('admin', 'admin123')
+    with sgrs.app.app_context():
+        grievance = sgrs.Grievance.query.filter_by(status='resolved').first()
+    with count_queries() as queries:
+        response = client.get(f'/grievance/{grievance.id}')
+    assert response.status_code == 200
+    assert b'Seeded update.' in response.data
+    assert len(queries) <= 4
+
+
+def test_admin_grievances(login, count_queries):
+    client = login('admin', 'admin123')
+    with count_queries() as queries:
+        response = client.get('/admin/grievances')
+    assert response.status_code == 200
+    assert len(queries) <= 2
+
+    with count_queries() as queries:
+        response = client.get('/admin/grievances?status=escalated&before=20')
+    assert response.status_code == 200
+    assert len(queries) <= 2
+
+
+def test_api_stats(sgrs, login, count_queries):
+    client = login('admin', 'admin123')
+    sgrs.stats_cache.clear()
+    with count_queries() as queries:
+        response = client.get('/api/stats')
+    assert response.status_code == 200
+    assert len(queries) <= 3
+
+    # Cache hit with a matching ETag: no aggregate queries, empty 304
+    with count_queries() as queries:
+        response = client.get('/api/stats', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert len(queries) == 0